@@ -1,19 +1,124 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sqlite3
 import hashlib
-from datetime import datetime
+import hmac
+import importlib.util
+import os
+import queue
+import threading
+import functools
+import zipfile
+from contextlib import contextmanager
 from io import StringIO, BytesIO
 
+CATEGORIES = ["protein(kg)", "perishables(kg)", "juice(bottle)", "groceries (kg)", "Other"]
+CATEGORY_INDEX = {category: i for i, category in enumerate(CATEGORIES)}
+
 # ======================
 # Database Setup
 # ======================
+@st.cache_resource
+def get_conn():
+    # One connection shared across reruns and sessions instead of connect/close per call
+    return sqlite3.connect('inventory.db', check_same_thread=False)
+
+@st.cache_resource
+def get_read_pool(size=4):
+    # WAL lets these read-only connections run alongside the single writer from get_conn()
+    pool = queue.Queue()
+    for _ in range(size):
+        conn = sqlite3.connect('file:inventory.db?mode=ro', uri=True, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA cache_size=-20000")
+        pool.put(conn)
+    return pool
+
+@contextmanager
+def read_conn():
+    pool = get_read_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+@st.cache_resource
+def get_write_lock():
+    return threading.Lock()
+
+@st.cache_resource
+def get_tx_state():
+    # Per-thread record of the open write transaction, so nested tx() calls can join it
+    return threading.local()
+
+@contextmanager
+def tx(invalidate=True):
+    # One write transaction at a time on the shared connection; caches are refreshed after commit
+    state = get_tx_state()
+    if getattr(state, 'conn', None) is not None:
+        # Nested: a savepoint lets this scope roll back on its own inside the outer transaction
+        conn = state.conn
+        state.invalidate = state.invalidate or invalidate
+        state.depth += 1
+        savepoint = f'tx_{state.depth}'
+        conn.execute(f'SAVEPOINT {savepoint}')
+        try:
+            yield conn
+            conn.execute(f'RELEASE {savepoint}')
+        except BaseException:
+            conn.execute(f'ROLLBACK TO {savepoint}')
+            conn.execute(f'RELEASE {savepoint}')
+            raise
+        finally:
+            state.depth -= 1
+        return
+    conn = get_conn()
+    with get_write_lock():
+        conn.execute('BEGIN IMMEDIATE')
+        state.conn, state.invalidate, state.depth = conn, invalidate, 0
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            state.conn = None
+    if state.invalidate:
+        clear_inventory_caches()
+        get_sales.clear()
+        get_daily_sales.clear()
+
+def with_conn(fn):
+    # Runs fn in its own transaction; inside an open tx() it runs in a savepoint of that one
+    @functools.wraps(fn)
+    def wrapper(*args, _conn=None, **kwargs):
+        if _conn is not None:
+            return fn(_conn, *args, **kwargs)
+        with tx() as conn:
+            return fn(conn, *args, **kwargs)
+    return wrapper
+
+@st.cache_resource
 def init_db():
-    conn = sqlite3.connect('inventory.db')
+    # Runs once per process so the schema checks and PRAGMAs are not repeated on every rerun
+    conn = get_conn()
     c = conn.cursor()
-    
+
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
+    c.execute("PRAGMA busy_timeout=5000")
+    c.execute("PRAGMA cache_size=-20000")
+
     c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (username TEXT PRIMARY KEY, password TEXT)''')
+                 (username TEXT PRIMARY KEY, password BLOB, salt BLOB)''')
+    
+    # Databases created before salted hashes lack the salt column
+    user_columns = [row[1] for row in c.execute("PRAGMA table_info(users)")]
+    if 'salt' not in user_columns:
+        c.execute("ALTER TABLE users ADD COLUMN salt BLOB")
     
     c.execute('''CREATE TABLE IF NOT EXISTS inventory
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -26,98 +131,233 @@ def init_db():
                   item_id INTEGER, quantity INTEGER,
                   sale_price REAL, sale_date TEXT,
                   FOREIGN KEY(item_id) REFERENCES inventory(id))''')
+
+    try:
+        c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_item ON inventory(item)")
+    except sqlite3.IntegrityError:
+        # Older databases may already hold duplicate item names
+        c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_item ON inventory(item)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sales_item_id ON sales(item_id)")
     
     try:
-        c.execute("INSERT OR IGNORE INTO users VALUES (?, ?)", 
-                 ('admin', make_hashes('admin123')))
+        salt = os.urandom(16)
+        c.execute("INSERT OR IGNORE INTO users VALUES (?, ?, ?)", 
+                 ('admin', make_hashes('admin123', salt), salt))
     except:
         pass
     
     conn.commit()
-    conn.close()
 
 # ======================
 # Authentication
 # ======================
-def make_hashes(password):
-    return hashlib.sha256(str.encode(password)).hexdigest()
+def make_hashes(password, salt):
+    return hashlib.pbkdf2_hmac('sha256', str.encode(password), salt, 100_000)
 
-def check_hashes(password, hashed_text):
-    return make_hashes(password) == hashed_text
+def check_hashes(password, hashed, salt):
+    if hashed is None:
+        return False
+    if salt is None:
+        # Unsalted SHA-256 hex from before the switch to PBKDF2
+        return isinstance(hashed, str) and hmac.compare_digest(
+            hashlib.sha256(str.encode(password)).hexdigest(), hashed)
+    return hmac.compare_digest(make_hashes(password, salt), hashed)
 
 def create_user(username, password):
-    conn = sqlite3.connect('inventory.db')
-    c = conn.cursor()
+    salt = os.urandom(16)
     try:
-        c.execute('INSERT INTO users VALUES (?,?)', 
-                 (username, make_hashes(password)))
-        conn.commit()
+        with tx(invalidate=False) as conn:
+            conn.execute('INSERT INTO users VALUES (?,?,?)', 
+                         (username, make_hashes(password, salt), salt))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def login_user(username, password):
-    conn = sqlite3.connect('inventory.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM users WHERE username = ?', (username,))
-    data = c.fetchone()
-    conn.close()
-    return data and check_hashes(password, data[1])
+    # Returns the (password, salt) record on success so the caller can cache it
+    with read_conn() as conn:
+        data = conn.execute('SELECT password, salt FROM users WHERE username = ?', (username,)).fetchone()
+    if not data or not check_hashes(password, data[0], data[1]):
+        return None
+    if data[1] is None:
+        # Upgrade a legacy SHA-256 hash now that the plain password is known
+        salt = os.urandom(16)
+        data = (make_hashes(password, salt), salt)
+        with tx(invalidate=False) as conn:
+            conn.execute('UPDATE users SET password=?, salt=? WHERE username=?', (data[0], salt, username))
+    return data
 
 # ======================
 # Inventory Functions
 # ======================
+def frame_from_cursor(cur, dtypes=None):
+    # Build the frame column-wise from the fetched tuples instead of going through pd.read_sql
+    dtypes = dtypes or {}
+    names = [d[0] for d in cur.description]
+    rows = cur.fetchall()
+    cols = list(zip(*rows)) if rows else [()] * len(names)
+    return pd.DataFrame({name: np.asarray(col, dtype=dtypes.get(name, object))
+                         for name, col in zip(names, cols)})
+
+@st.cache_data(ttl=300)
 def get_inventory():
-    conn = sqlite3.connect('inventory.db')
-    df = pd.read_sql('SELECT * FROM inventory', conn)
-    conn.close()
+    with read_conn() as conn:
+        cur = conn.execute('''SELECT id, item, category, COALESCE(quantity, 0) AS quantity,
+                                     COALESCE(price, 0) AS price, COALESCE(min_stock, 5) AS min_stock
+                              FROM inventory''')
+        df = frame_from_cursor(cur, {'id': np.int64, 'quantity': np.int64,
+                                     'price': np.float64, 'min_stock': np.int64})
+    # Few distinct categories and small counts: store codes and the narrowest integer type
+    df['category'] = df['category'].astype('category')
+    df['quantity'] = pd.to_numeric(df['quantity'], downcast='integer')
+    df['min_stock'] = pd.to_numeric(df['min_stock'], downcast='integer')
     return df
 
-def add_item(item, category, quantity, price, min_stock=5):
-    conn = sqlite3.connect('inventory.db')
-    c = conn.cursor()
-    c.execute('INSERT INTO inventory (item, category, quantity, price, min_stock) VALUES (?,?,?,?,?)',
-              (item, category, quantity, price, min_stock))
-    conn.commit()
-    conn.close()
+@st.cache_data(ttl=300)
+def get_item_lookup():
+    # Item name -> fields the Sales form needs, indexed once per inventory change
+    return get_inventory().drop_duplicates('item').set_index('item')[['id', 'quantity', 'price']]
 
-def update_item(item_id, item, category, quantity, price, min_stock):
-    conn = sqlite3.connect('inventory.db')
-    c = conn.cursor()
-    c.execute('''UPDATE inventory SET item=?, category=?, quantity=?, price=?, min_stock=?
-                 WHERE id=?''', (item, category, quantity, price, min_stock, item_id))
-    conn.commit()
-    conn.close()
+@st.cache_data(ttl=300)
+def build_excel_report():
+    # constant_memory flushes each finished row, so cells must be written in row order,
+    # which pandas' column-by-column to_excel does not do
+    import xlsxwriter
+    
+    inventory = get_inventory().astype(object)
+    # Missing values become blank cells; xlsxwriter rejects NaN
+    inventory = inventory.where(inventory.notna(), None)
+    excel_buffer = BytesIO()
+    workbook = xlsxwriter.Workbook(excel_buffer, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Inventory')
+    worksheet.write_row(0, 0, inventory.columns)
+    for row_num, row in enumerate(inventory.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_num, 0, row)
+    workbook.close()
+    return excel_buffer.getvalue()
 
-def delete_item(item_id):
-    conn = sqlite3.connect('inventory.db')
-    c = conn.cursor()
-    c.execute('DELETE FROM inventory WHERE id=?', (item_id,))
-    conn.commit()
-    conn.close()
+def clear_inventory_caches():
+    get_inventory.clear()
+    get_item_lookup.clear()
+    build_excel_report.clear()
+    get_category_summary.clear()
+    get_price_counts.clear()
+
+@with_conn
+def add_item(conn, item, category, quantity, price, min_stock=5):
+    try:
+        conn.execute('INSERT INTO inventory (item, category, quantity, price, min_stock) VALUES (?,?,?,?,?)',
+                     (item, category, quantity, price, min_stock))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+def format_row_numbers(row_numbers, limit=10):
+    return ', '.join(map(str, row_numbers[:limit])) + (' ...' if len(row_numbers) > limit else '')
+
+def prepare_import(imported):
+    # Returns (rows, bad_rows, duplicate_rows); rows is None unless both lists are empty.
+    # Row numbers are 1-based data rows, matching the Add form's rules.
+    item = imported['item'].astype('string').str.strip()
+    category = imported['category'].astype('string').str.strip()
+    category = category.where(category.notna() & category.ne(''), 'Other')
+    numbers = {col: pd.to_numeric(imported[col], errors='coerce') for col in ('quantity', 'price', 'min_stock')}
+    minimums = {'quantity': 0, 'price': 0, 'min_stock': 1}
+    bad = item.isna() | item.eq('')
+    for col, values in numbers.items():
+        bad |= values.isna() | (values < minimums[col])
+        if col != 'price':
+            bad |= values % 1 != 0
+    duplicated = item.notna() & item.duplicated(keep=False)
+    bad_rows = (np.flatnonzero(bad.to_numpy()) + 1).tolist()
+    duplicate_rows = (np.flatnonzero(duplicated.to_numpy()) + 1).tolist()
+    if bad_rows or duplicate_rows:
+        return None, bad_rows, duplicate_rows
+    rows = list(zip(item.tolist(),
+                    category.tolist(),
+                    numbers['quantity'].astype(np.int64).tolist(),
+                    numbers['price'].astype(np.float64).tolist(),
+                    numbers['min_stock'].astype(np.int64).tolist()))
+    return rows, [], []
+
+def add_items_bulk(rows):
+    # A clash anywhere in the batch rolls back the whole import
+    try:
+        with tx() as conn:
+            conn.executemany('INSERT INTO inventory (item, category, quantity, price, min_stock) VALUES (?,?,?,?,?)',
+                             rows)
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+@with_conn
+def update_item(conn, item_id, item, category, quantity, price, min_stock):
+    try:
+        conn.execute('''UPDATE inventory SET item=?, category=?, quantity=?, price=?, min_stock=?
+                        WHERE id=?''', (item, category, quantity, price, min_stock, item_id))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+@with_conn
+def delete_item(conn, item_id):
+    conn.execute('DELETE FROM inventory WHERE id=?', (item_id,))
 
 # ======================
 # Sales Functions
 # ======================
-def record_sale(item_id, quantity, sale_price):
-    conn = sqlite3.connect('inventory.db')
-    c = conn.cursor()
-    c.execute('UPDATE inventory SET quantity = quantity - ? WHERE id = ?', (quantity, item_id))
-    sale_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    c.execute('INSERT INTO sales (item_id, quantity, sale_price, sale_date) VALUES (?,?,?,?)',
-              (item_id, quantity, sale_price, sale_date))
-    conn.commit()
-    conn.close()
+@with_conn
+def record_sale(conn, item_id, quantity, sale_price):
+    conn.execute('UPDATE inventory SET quantity = quantity - ? WHERE id = ?', (quantity, item_id))
+    conn.execute('''INSERT INTO sales (item_id, quantity, sale_price, sale_date)
+                    VALUES (?,?,?,datetime('now', 'localtime'))''',
+                 (item_id, quantity, sale_price))
 
-def get_sales():
-    conn = sqlite3.connect('inventory.db')
-    df = pd.read_sql('''SELECT s.id, i.item, s.quantity, s.sale_price, s.sale_date
-                        FROM sales s JOIN inventory i ON s.item_id = i.id''', conn)
-    conn.close()
+@st.cache_data(ttl=300)
+def get_sales(limit=100):
+    # Most recent sales only; totals over the full history come from get_daily_sales()
+    with read_conn() as conn:
+        cur = conn.execute('''SELECT s.id, i.item, s.quantity, s.sale_price, s.sale_date
+                              FROM sales s JOIN inventory i ON s.item_id = i.id
+                              ORDER BY s.id DESC LIMIT ?''', (limit,))
+        df = frame_from_cursor(cur, {'id': np.int64, 'quantity': np.int64, 'sale_price': np.float64})
+    # record_sale always writes this layout, so skip pandas' per-value format inference
+    df['sale_date'] = pd.to_datetime(df['sale_date'], format='%Y-%m-%d %H:%M:%S', cache=True)
     return df
 
+@st.cache_data(ttl=300)
+def get_daily_sales():
+    with read_conn() as conn:
+        cur = conn.execute('''SELECT DATE(sale_date) AS day, SUM(sale_price) AS total
+                              FROM sales GROUP BY DATE(sale_date) ORDER BY day''')
+        return frame_from_cursor(cur, {'total': np.float64}).set_index('day')['total']
+
+# ======================
+# Analytics Functions
+# ======================
+@st.cache_data(ttl=300)
+def get_category_summary():
+    with read_conn() as conn:
+        cur = conn.execute('''SELECT category,
+                                     COALESCE(SUM(quantity), 0) AS quantity,
+                                     COALESCE(SUM(quantity * price), 0) AS total_value
+                              FROM inventory GROUP BY category ORDER BY category''')
+        return frame_from_cursor(cur, {'quantity': np.int64, 'total_value': np.float64}).set_index('category')
+
+@st.cache_data(ttl=300)
+def get_price_counts():
+    with read_conn() as conn:
+        cur = conn.execute('''SELECT price, COUNT(*) AS count FROM inventory
+                              WHERE price IS NOT NULL GROUP BY price ORDER BY price''')
+        return frame_from_cursor(cur, {'price': np.float64, 'count': np.int64}).set_index('price')['count']
+
+def get_price_histogram(bins=20):
+    # Fixed number of bars however many distinct prices there are
+    counts = get_price_counts()
+    hist, edges = np.histogram(counts.index.to_numpy(), bins=bins, weights=counts.to_numpy())
+    labels = [f'{lo:.2f}-{hi:.2f}' for lo, hi in zip(edges[:-1], edges[1:])]
+    return pd.Series(hist.astype(np.int64), index=labels)
+
 # ======================
 # Authentication Page
 # ======================
@@ -137,9 +377,17 @@ def auth_page():
             password = st.text_input("Password", type='password')
             
             if st.form_submit_button("Login"):
-                if login_user(username, password):
+                # Logging back in within the same session checks the cached record, not the DB
+                cached = st.session_state.get('credentials')
+                if cached and cached[0] == username:
+                    record = cached[1:] if check_hashes(password, cached[1], cached[2]) else None
+                else:
+                    record = login_user(username, password)
+                
+                if record:
                     st.session_state.logged_in = True
                     st.session_state.username = username
+                    st.session_state.credentials = (username, *record)
                     st.success("Login successful!")
                     st.rerun()
                 else:
@@ -169,12 +417,12 @@ def auth_page():
 def main_app():
     st.title("📊 Store Inventory Management System")
     
-    inventory = get_inventory()
     menu = ["Inventory", "Sales", "Analytics"]
     choice = st.sidebar.selectbox("Menu", menu)
     
     if choice == "Inventory":
         st.header("Inventory Management")
+        inventory = get_inventory()
         
         with st.expander("Add New Item"):
             with st.form("add_form", clear_on_submit=True):
@@ -186,12 +434,56 @@ def main_app():
                 min_stock = st.number_input("Min Stock*", min_value=1, value=5)
                 
                 if st.form_submit_button("Add Item"):
-                    if item:
-                        add_item(item, category, quantity, price, min_stock)
+                    if not item:
+                        st.error("Item name required")
+                    elif add_item(item, category, quantity, price, min_stock):
                         st.success("Item added!")
-                        inventory = get_inventory()
+                        st.rerun()
                     else:
-                        st.error("Item name required")
+                        st.error("Item already exists")
+
+        with st.expander("Import CSV/Excel"):
+            with st.form("import_form", clear_on_submit=True):
+                upload = st.file_uploader("Inventory file", type=["csv", "xlsx"])
+                st.caption("Columns: item, category, quantity, price, min_stock (optional)")
+                
+                if st.form_submit_button("Import"):
+                    if upload is None:
+                        st.error("Choose a file to import")
+                    else:
+                        imported = None
+                        try:
+                            if upload.name.endswith(".csv"):
+                                imported = pd.read_csv(upload)
+                            else:
+                                imported = pd.read_excel(upload)
+                        except ImportError:
+                            st.error("Excel import requires openpyxl. Install with: pip install openpyxl")
+                        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError,
+                                ValueError, zipfile.BadZipFile) as e:
+                            st.error(f"Could not read {upload.name}: {e}")
+                        
+                        if imported is not None:
+                            if 'min_stock' not in imported:
+                                imported['min_stock'] = 5
+                            missing = {'item', 'category', 'quantity', 'price'} - set(imported.columns)
+                            if missing:
+                                st.error(f"Missing columns: {', '.join(sorted(missing))}")
+                            else:
+                                rows, bad_rows, duplicate_rows = prepare_import(imported)
+                                if bad_rows:
+                                    st.error("Rows need an item name, quantity and price of at least 0 and "
+                                             "min_stock of at least 1 (whole numbers for quantity and min_stock). "
+                                             f"Check rows: {format_row_numbers(bad_rows)}")
+                                if duplicate_rows:
+                                    st.error("The file lists the same item more than once. "
+                                             f"Check rows: {format_row_numbers(duplicate_rows)}")
+                                if rows is not None:
+                                    if add_items_bulk(rows):
+                                        st.success(f"Imported {len(rows)} items!")
+                                        st.rerun()
+                                    else:
+                                        st.error("Import contains items that already exist")
         
         if inventory is not None and not inventory.empty:
             low_stock = inventory[inventory['quantity'] < inventory['min_stock']]
@@ -201,16 +493,15 @@ def main_app():
             
             st.subheader("Edit Inventory")
             edit_choice = st.selectbox("Select Item", inventory['item'])
-            item_data = inventory[inventory['item'] == edit_choice].iloc[0]
+            # Plain Python values, so the widgets below get no pandas scalars
+            item_data = inventory.loc[inventory['item'] == edit_choice].iloc[0].to_dict()
             
             with st.form("edit_form"):
                 new_item = st.text_input("Name", value=item_data['item'])
                 
-                categories = ["protein(kg)", "perishables(kg)", "juice(bottle)", "groceries (kg)", "Other"]
-                current_category = item_data['category']
-                default_index = categories.index(current_category) if current_category in categories else 4
+                default_index = CATEGORY_INDEX.get(item_data['category'], 4)
                 
-                new_category = st.selectbox("Category", categories, index=default_index)
+                new_category = st.selectbox("Category", CATEGORIES, index=default_index)
                 new_quantity = st.number_input("Quantity", min_value=0, value=item_data['quantity'])
                 new_price = st.number_input("Price", min_value=0.0, step=0.01, value=item_data['price'])
                 new_min_stock = st.number_input("Min Stock", min_value=1, value=item_data['min_stock'])
@@ -222,17 +513,19 @@ def main_app():
                     delete_btn = st.form_submit_button("Delete Item")
                 
                 if update_btn:
-                    update_item(item_data['id'], new_item, new_category, 
-                              new_quantity, new_price, new_min_stock)
-                    st.success("Item updated!")
-                    st.rerun()
+                    if update_item(item_data['id'], new_item, new_category, 
+                                   new_quantity, new_price, new_min_stock):
+                        st.success("Item updated!")
+                        st.rerun()
+                    else:
+                        st.error("Another item already has that name")
                     
                 if delete_btn:
                     delete_item(item_data['id'])
                     st.success("Item deleted!")
                     st.rerun()
             
-            st.dataframe(inventory.drop(columns=['id']))
+            st.dataframe(inventory, column_order=('item', 'category', 'quantity', 'price', 'min_stock'))
             
             # Export Functionality
             st.subheader("Export Options")
@@ -242,13 +535,8 @@ def main_app():
             inventory.to_string(txt_buffer, index=False)
             txt_data = txt_buffer.getvalue()
             
-            # Excel Export
-            try:
-                excel_buffer = BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                    inventory.to_excel(writer, index=False, sheet_name='Inventory')
-                    writer.close()
-                
+            # Excel Export (only built when clicked, so check for the engine up front)
+            if importlib.util.find_spec('xlsxwriter') is not None:
                 col1, col2 = st.columns(2)
                 with col1:
                     st.download_button(
@@ -260,12 +548,12 @@ def main_app():
                 with col2:
                     st.download_button(
                         label="💾 Export as Excel",
-                        data=excel_buffer,
+                        data=build_excel_report,
                         file_name="inventory_report.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
-            except ImportError:
-                st.warning("Excel export requires openpyxl. Install with: pip install openpyxl")
+            else:
+                st.warning("Excel export requires xlsxwriter. Install with: pip install xlsxwriter")
                 st.download_button(
                     label="📝 Export as TXT",
                     data=txt_data,
@@ -278,16 +566,17 @@ def main_app():
     
     elif choice == "Sales":
         st.header("Sales Tracking")
-        inventory = get_inventory()
+        lookup = get_item_lookup()
         
-        if not inventory.empty:
+        if not lookup.empty:
             with st.form("sale_form"):
-                item = st.selectbox("Item", inventory['item'])
-                item_id = inventory[inventory['item'] == item].iloc[0]['id']
-                max_qty = inventory[inventory['item'] == item].iloc[0]['quantity']
+                item = st.selectbox("Item", lookup.index)
+                row = lookup.loc[item]
+                item_id = int(row.id)
+                max_qty = int(row.quantity)
                 quantity = st.number_input("Quantity", min_value=1, max_value=max_qty)
                 sale_price = st.number_input("Sale Price", min_value=0.0, step=0.01,
-                    value=float(inventory[inventory['item'] == item].iloc[0]['price']))
+                    value=float(row.price))
                 
                 if st.form_submit_button("Record Sale"):
                     record_sale(item_id, quantity, sale_price)
@@ -298,9 +587,7 @@ def main_app():
                 st.subheader("Sales History")
                 st.dataframe(sales)
                 
-                sales['sale_date'] = pd.to_datetime(sales['sale_date'])
-                daily_sales = sales.groupby(sales['sale_date'].dt.date)['sale_price'].sum()
-                st.bar_chart(daily_sales)
+                st.bar_chart(get_daily_sales())
             else:
                 st.info("No sales recorded")
         else:
@@ -308,21 +595,19 @@ def main_app():
     
     elif choice == "Analytics":
         st.header("Inventory Analytics")
-        inventory = get_inventory()
+        summary = get_category_summary()
         
-        if not inventory.empty:
-            inventory['total_value'] = inventory['quantity'] * inventory['price']
-            
+        if not summary.empty:
             col1, col2 = st.columns(2)
             with col1:
                 st.subheader("Stock by Category")
-                st.bar_chart(inventory.groupby('category')['quantity'].sum())
+                st.bar_chart(summary['quantity'])
             with col2:
                 st.subheader("Value by Category")
-                st.bar_chart(inventory.groupby('category')['total_value'].sum())
+                st.bar_chart(summary['total_value'])
             
             st.subheader("Price Distribution")
-            st.bar_chart(inventory['price'].value_counts())
+            st.bar_chart(get_price_histogram(), sort=False)
         else:
             st.warning("No data to analyze")
 